@@ -1,27 +1,12 @@
 import streamlit as st
-import json
-import re
+import orjson
+
+from arb_core import compare_arb_files, split_arb
 
 # --------------------------------
 # 1. Mappings and Helper Functions
 # --------------------------------
 
-language_map = {
-    "dutch": "nl",
-    "german": "de",
-    "italian": "it",
-    "japanese": "ja",
-    "korean": "ko",
-    "polish": "pl",
-    "portuguese": "pt",
-    "russian": "ru",
-    "spanish": "es",
-    "turkish": "tr",
-    "french": "fr",
-    "fr": "fr",
-    "english": "en",
-}
-
 # This dictionary maps each technical “issue code” to a user-friendly description:
 FRIENDLY_ISSUE_DESCRIPTIONS = {
     "missing_start_space": (
@@ -54,129 +39,186 @@ FRIENDLY_ISSUE_DESCRIPTIONS = {
     )
 }
 
-def detect_language_code(file_name):
-    """
-    Looks for a known language name in the file name.
-    Returns a short code like 'en', 'es', etc., or None if no match.
-    """
-    lower_name = file_name.lower()
-    for lang, code in language_map.items():
-        if lang in lower_name:
-            return code
-    return None
+# Markdown bullet per issue code, prebuilt so the render loop does a single
+# dict probe instead of reformatting the same strings on every rerun.
+_ISSUE_BULLET = {
+    code: f"• **{code}**: {desc}"
+    for code, desc in FRIENDLY_ISSUE_DESCRIPTIONS.items()
+}
 
-def extract_params(text):
+# --------------------------------
+# 2. STREAMLIT APP
+# --------------------------------
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_arb(raw):
     """
-    Finds placeholders in curly braces, e.g., {name}, returning them as a set.
+    Parses raw ARB bytes and returns the content dict with @-prefixed
+    metadata already split out. Cached on the file bytes so reruns don't
+    re-parse the same upload.
     """
-    matches = re.findall(r"{(\w+)}", text)
-    return set(matches)
+    content, _meta = split_arb(orjson.loads(raw))
+    return content
 
-def check_text_issues(source, target, lang_code):
+@st.cache_data(show_spinner=False, max_entries=16)
+def _compare_cached(ref_bytes, tgt_bytes, tgt_name):
     """
-    Checks for formatting differences: spaces, line breaks, final period, etc.
-    Returns a list of 'issue codes'.
+    Cached wrapper around compare_arb_files, keyed on the uploaded bytes.
+    Streamlit reruns the whole script on every interaction; this keeps the
+    comparison from being recomputed when nothing changed.
     """
-    issues = []
-
-    # Leading/trailing space checks
-    if source.startswith(" ") and not target.startswith(" "):
-        issues.append("missing_start_space")
-    if source.endswith(" ") and not target.endswith(" "):
-        issues.append("missing_end_space")
+    return compare_arb_files(_parse_arb(ref_bytes), _parse_arb(tgt_bytes), tgt_name)
 
-    # Leading/trailing newline checks
-    if source.startswith("\n") and not target.startswith("\n"):
-        issues.append("missing_start_line_break")
-    if source.endswith("\n") and not target.endswith("\n"):
-        issues.append("missing_end_line_break")
+# Lists longer than this are rendered as a virtualized dataframe instead of
+# an inline list, which freezes the browser for huge key mismatches.
+_MAX_INLINE_KEYS = 200
 
-    # Compare line-break count
-    if source.count("\n") != target.count("\n"):
-        issues.append("wrong_line_break_count")
-
-    # Check final dot, except for Japanese
-    if lang_code != "ja":
-        if source.endswith(".") and not target.endswith("."):
-            issues.append("missing_end_dot")
-        elif not source.endswith(".") and target.endswith("."):
-            issues.append("extra_end_dot")
-
-    return issues
-
-def compare_arb_files(reference_data, target_data, target_file_name):
+def _write_key_list(keys):
     """
-    Compares reference ARB data vs. target ARB data and returns details:
-      - Missing/extra keys
-      - Empty translations
-      - Identical translations
-      - Parameter / text issues
+    Writes a list of keys, switching to a scrollable dataframe for large
+    lists so the frontend only renders the visible rows.
     """
-    ref_keys = [k for k in reference_data.keys() if not k.startswith("@")]
-    tgt_keys = [k for k in target_data.keys() if not k.startswith("@")]
-
-    missing_keys = [k for k in ref_keys if k not in tgt_keys]
-    extra_keys = [k for k in tgt_keys if k not in ref_keys]
-
-    empty_translations = []
-    identical_translations = []
-    parameter_issues = []
-
-    lang_code = detect_language_code(target_file_name) or "unknown"
-
-    # Compare only keys that exist in both
-    for key in ref_keys:
-        if key not in tgt_keys:
-            continue
-
-        ref_val = reference_data[key]
-        tgt_val = target_data[key]
-
-        # Check empty
-        if not isinstance(ref_val, str) or not isinstance(tgt_val, str):
-            continue
-        ref_val = ref_val.strip()
-        tgt_val = tgt_val.strip()
-
-        # Check empty
-        if not tgt_val:
-            empty_translations.append(key)
-        elif ref_val == tgt_val:
-            identical_translations.append(key)
+    if len(keys) > _MAX_INLINE_KEYS:
+        import pandas as pd
 
-        # Check parameters
-        ref_params = extract_params(ref_val)
-        tgt_params = extract_params(tgt_val)
-        missing_params = [p for p in ref_params if p not in tgt_params]
-        extra_params = [p for p in tgt_params if p not in ref_params]
+        st.dataframe(
+            pd.DataFrame(keys, columns=["key"]),
+            use_container_width=True,
+            height=300,
+        )
+    else:
+        st.write(keys)
 
-        # Check text/format issues
-        text_issues = check_text_issues(ref_val, tgt_val, lang_code)
 
-        if missing_params or extra_params or text_issues:
-            parameter_issues.append({
-                "key": key,
-                "reference": ref_val,
-                "target": tgt_val,
-                "missingParams": missing_params,
-                "extraParams": extra_params,
-                "textIssues": text_issues
-            })
-
-    return {
-        "langCode": lang_code,
-        "missingKeys": missing_keys,
-        "extraKeys": extra_keys,
-        "emptyTranslations": empty_translations,
-        "identicalTranslations": identical_translations,
-        "parameterIssues": parameter_issues,
-    }
+def _render_issue_detail(issues, row):
+    """
+    Renders the full reference/target texts and diagnostics for one issue
+    row. Built as one Markdown blob: each Streamlit call is a separate
+    message to the frontend, which adds up over hundreds of issues.
+    """
+    parts = [
+        f"**Reference text:**\n```\n{issues['refs'][row]}\n```",
+        f"**Target text:**\n```\n{issues['tgts'][row]}\n```",
+    ]
+
+    # Missing params
+    if issues["missing"][row]:
+        parts.append(
+            "**Missing placeholders in the target:** "
+            f"{issues['missing'][row]}\n\n"
+            "Please ensure these parameters are included, "
+            "e.g., {example}."
+        )
+    # Extra params
+    if issues["extra"][row]:
+        parts.append(
+            "**Unexpected placeholders in the target:** "
+            f"{issues['extra'][row]}\n\n"
+            "If they are not needed, please remove them."
+        )
+
+    # Text issues
+    if issues["text"][row]:
+        bullets = "\n".join(
+            _ISSUE_BULLET.get(code, f"• **{code}**: Unknown issue: {code}")
+            for code in issues["text"][row]
+        )
+        parts.append("**Text Issues Detected:**\n\n" + bullets)
+
+    with st.expander(f"Key: {issues['keys'][row]}", expanded=True):
+        st.markdown("\n\n".join(parts))
+
+
+@st.fragment
+def _render_results(results):
+    """
+    Renders the comparison results. Running this as a fragment means UI
+    interactions inside it (expander toggles, scrolling a dataframe) rerun
+    only this block, not the whole script.
+    """
+    st.subheader("Comparison Results")
+
+    # Language code
+    st.write(f"**Detected Language Code:** {results['langCode']}")
+
+    # Missing keys
+    if results["missingKeys"]:
+        with st.expander("Missing Keys"):
+            st.write(
+                "These keys exist in the reference file but are **not** "
+                "present in the target file."
+            )
+            _write_key_list(results["missingKeys"])
+    else:
+        st.success("No missing keys found.")
+
+    # Extra keys
+    if results["extraKeys"]:
+        with st.expander("Extra Keys"):
+            st.write(
+                "These keys exist in the target file but are **not** "
+                "present in the reference file."
+            )
+            _write_key_list(results["extraKeys"])
+    else:
+        st.success("No extra keys found.")
+
+    # Empty translations
+    if results["emptyTranslations"]:
+        with st.expander("Empty Translations"):
+            st.write(
+                "These keys have **empty** translations. "
+                "Please add the correct text or confirm if they're intentionally empty."
+            )
+            _write_key_list(results["emptyTranslations"])
+    else:
+        st.success("No empty translations found.")
+
+    # Identical translations
+    if results["identicalTranslations"]:
+        st.warning("Some translations are identical to the reference.")
+        with st.expander("Identical Translations"):
+            st.write(
+                "The following keys have translations exactly the same as the reference."
+                "\nIf this is intentional (e.g., brand names), ignore this warning."
+            )
+            _write_key_list(results["identicalTranslations"])
+    else:
+        st.success("No identical translations found.")
+
+    # Parameter and text issues
+    issues = results["parameterIssues"]
+    if issues["keys"]:
+        st.warning("Some entries have parameter or formatting issues.")
+        import pandas as pd
+
+        # Columnar summary grid: the parallel lists from compare_arb_files
+        # Arrow-encode directly, and the dataframe virtualizes rows instead
+        # of mounting one expander per issue.
+        summary = pd.DataFrame(
+            {
+                "key": issues["keys"],
+                "missing params": [", ".join(m) for m in issues["missing"]],
+                "extra params": [", ".join(e) for e in issues["extra"]],
+                "text issues": [", ".join(t) for t in issues["text"]],
+            }
+        )
+        selection = st.dataframe(
+            summary,
+            use_container_width=True,
+            height=300,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+        )
+
+        # Full details only for the selected row, rendered on demand.
+        for row in selection.selection.rows:
+            _render_issue_detail(issues, row)
+    else:
+        st.success("No parameter or formatting issues found.")
 
 
-# --------------------------------
-# 2. STREAMLIT APP
-# --------------------------------
-
 def main():
     st.title("ARB File Comparison Tool")
     st.write(
@@ -192,103 +234,14 @@ def main():
     if ref_file and tgt_file:
         if st.button("Compare ARB Files"):
             try:
-                reference_data = json.load(ref_file)
-                target_data = json.load(tgt_file)
-
-                results = compare_arb_files(reference_data, target_data, tgt_file.name)
-
-                st.subheader("Comparison Results")
-
-                # Language code
-                st.write(f"**Detected Language Code:** {results['langCode']}")
-
-                # Missing keys
-                if results["missingKeys"]:
-                    with st.expander("Missing Keys"):
-                        st.write(
-                            "These keys exist in the reference file but are **not** "
-                            "present in the target file."
-                        )
-                        st.write(results["missingKeys"])
-                else:
-                    st.success("No missing keys found.")
-
-                # Extra keys
-                if results["extraKeys"]:
-                    with st.expander("Extra Keys"):
-                        st.write(
-                            "These keys exist in the target file but are **not** "
-                            "present in the reference file."
-                        )
-                        st.write(results["extraKeys"])
-                else:
-                    st.success("No extra keys found.")
-
-                # Empty translations
-                if results["emptyTranslations"]:
-                    with st.expander("Empty Translations"):
-                        st.write(
-                            "These keys have **empty** translations. "
-                            "Please add the correct text or confirm if they're intentionally empty."
-                        )
-                        st.write(results["emptyTranslations"])
-                else:
-                    st.success("No empty translations found.")
-
-                # Identical translations
-                if results["identicalTranslations"]:
-                    st.warning("Some translations are identical to the reference.")
-                    with st.expander("Identical Translations"):
-                        st.write(
-                            "The following keys have translations exactly the same as the reference."
-                            "\nIf this is intentional (e.g., brand names), ignore this warning."
-                        )
-                        st.write(results["identicalTranslations"])
-                else:
-                    st.success("No identical translations found.")
-
-                # Parameter and text issues
-                if results["parameterIssues"]:
-                    st.warning("Some entries have parameter or formatting issues.")
-                    for issue in results["parameterIssues"]:
-                        with st.expander(f"Key: {issue['key']}"):
-                            st.markdown(
-                                f"**Reference text:**\n```\n{issue['reference']}\n```"
-                            )
-                            st.markdown(
-                                f"**Target text:**\n```\n{issue['target']}\n```"
-                            )
-
-                            # Missing params
-                            if issue["missingParams"]:
-                                st.error(
-                                    "Missing placeholders in the target:\n"
-                                    f"{issue['missingParams']}\n\n"
-                                    "Please ensure these parameters are included, "
-                                    "e.g., {example}."
-                                )
-                            # Extra params
-                            if issue["extraParams"]:
-                                st.error(
-                                    "Unexpected placeholders in the target:\n"
-                                    f"{issue['extraParams']}\n\n"
-                                    "If they are not needed, please remove them."
-                                )
-
-                            # Text issues
-                            if issue["textIssues"]:
-                                st.error("Text Issues Detected:")
-                                for code in issue["textIssues"]:
-                                    description = FRIENDLY_ISSUE_DESCRIPTIONS.get(
-                                        code,
-                                        f"Unknown issue: {code}"
-                                    )
-                                    st.write(f"• **{code}**: {description}")
-                else:
-                    st.success("No parameter or formatting issues found.")
-
+                st.session_state["results"] = _compare_cached(
+                    ref_file.getvalue(), tgt_file.getvalue(), tgt_file.name
+                )
             except Exception as e:
                 st.error(f"An error occurred: {e}")
 
+    if "results" in st.session_state:
+        _render_results(st.session_state["results"])
+
 if __name__ == "__main__":
     main()
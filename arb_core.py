@@ -0,0 +1,257 @@
+"""
+Pure-Python core of the ARB comparison: language detection, placeholder
+extraction, formatting checks and the key-diffing loop. No Streamlit
+imports, so it can be used standalone and is fully type-annotated for
+optional ahead-of-time compilation with mypyc (`mypyc arb_core.py`); the
+produced extension module shadows this file transparently when present.
+"""
+
+import re
+import sys
+from itertools import product
+
+language_map = {
+    "dutch": "nl",
+    "german": "de",
+    "italian": "it",
+    "japanese": "ja",
+    "korean": "ko",
+    "polish": "pl",
+    "portuguese": "pt",
+    "russian": "ru",
+    "spanish": "es",
+    "turkish": "tr",
+    "french": "fr",
+    "fr": "fr",
+    "english": "en",
+}
+
+# One alternation compiled at import time instead of 13 substring scans per
+# upload. Longest-first so "portuguese" wins over "pt"; the letter
+# lookarounds keep "fr" from matching inside words like "africa" while
+# still matching it after separators ("app_fr.arb").
+_LANG_RE = re.compile(
+    r"(?<![a-z])("
+    + "|".join(sorted(language_map, key=len, reverse=True))
+    + r")(?![a-z])",
+    re.IGNORECASE,
+)
+
+# Placeholder pattern, compiled once instead of on every key comparison.
+_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+def detect_language_code(file_name: str) -> str | None:
+    """
+    Looks for a known language name in the file name.
+    Returns a short code like 'en', 'es', etc., or None if no match.
+    """
+    match = _LANG_RE.search(file_name)
+    return language_map[match.group(1).lower()] if match else None
+
+def extract_params(text: str) -> set[str]:
+    """
+    Finds placeholders in curly braces, e.g., {name}, returning them as a set.
+    """
+    return {m.group(1) for m in _PARAM_RE.finditer(text)}
+
+# The endpoint checks only care whether a string starts/ends with a space,
+# a newline or a period, so the answers for every combination of the four
+# endpoint characters are precomputed into one dict probe. Each entry holds
+# the issues reported before the line-break-count check and the dot issues
+# reported after it, preserving the original ordering. Two tables: the
+# Japanese one skips the final-dot checks.
+
+_ENDPOINT_CHARS = ("", " ", "\n", ".")
+
+def _norm_endpoint(ch: str) -> str:
+    return ch if ch in (" ", "\n", ".") else ""
+
+def _endpoint_issues(
+    src_first: str,
+    src_last: str,
+    tgt_first: str,
+    tgt_last: str,
+    check_dot: bool,
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    pre: list[str] = []
+    if src_first == " " and tgt_first != " ":
+        pre.append("missing_start_space")
+    if src_last == " " and tgt_last != " ":
+        pre.append("missing_end_space")
+    if src_first == "\n" and tgt_first != "\n":
+        pre.append("missing_start_line_break")
+    if src_last == "\n" and tgt_last != "\n":
+        pre.append("missing_end_line_break")
+
+    post: list[str] = []
+    if check_dot:
+        if src_last == "." and tgt_last != ".":
+            post.append("missing_end_dot")
+        elif src_last != "." and tgt_last == ".":
+            post.append("extra_end_dot")
+
+    return tuple(pre), tuple(post)
+
+_ISSUE_TABLE = {
+    combo: _endpoint_issues(*combo, check_dot=True)
+    for combo in product(_ENDPOINT_CHARS, repeat=4)
+}
+_ISSUE_TABLE_JA = {
+    combo: _endpoint_issues(*combo, check_dot=False)
+    for combo in product(_ENDPOINT_CHARS, repeat=4)
+}
+
+def _check_text(
+    table: dict[tuple[str, str, str, str], tuple[tuple[str, ...], tuple[str, ...]]],
+    source: str,
+    target: str,
+) -> list[str]:
+    # Identical strings trivially pass every check. compare_arb_files
+    # already skips identical translations, but direct callers get the
+    # same zero-work fast path.
+    if source is target or source == target:
+        return []
+
+    pre, post = table[
+        (
+            _norm_endpoint(source[:1]),
+            _norm_endpoint(source[-1:]),
+            _norm_endpoint(target[:1]),
+            _norm_endpoint(target[-1:]),
+        )
+    ]
+
+    issues = list(pre)
+    # Compare line-break count: the only check needing a full string scan
+    if source.count("\n") != target.count("\n"):
+        issues.append("wrong_line_break_count")
+    issues.extend(post)
+
+    return issues
+
+def _check_default(source: str, target: str) -> list[str]:
+    return _check_text(_ISSUE_TABLE, source, target)
+
+def _check_ja(source: str, target: str) -> list[str]:
+    return _check_text(_ISSUE_TABLE_JA, source, target)
+
+def check_text_issues(source: str, target: str, lang_code: str) -> list[str]:
+    """
+    Checks for formatting differences: spaces, line breaks, final period, etc.
+    Returns a list of 'issue codes'.
+    """
+    checker = _check_ja if lang_code == "ja" else _check_default
+    return checker(source, target)
+
+def split_arb(data: dict) -> tuple[dict, dict]:
+    """
+    Splits a parsed ARB dict into (content, metadata) in a single pass,
+    keyed on the @ prefix ARB uses for metadata entries. Keys are interned
+    so the set operations in compare_arb_files hash and compare by pointer
+    identity across the two files.
+    """
+    content: dict = {}
+    meta: dict = {}
+    for k, v in data.items():
+        k = sys.intern(k)
+        (meta if k.startswith("@") else content)[k] = v
+    return content, meta
+
+def compare_arb_files(
+    reference_data: dict,
+    target_data: dict,
+    target_file_name: str,
+) -> dict:
+    """
+    Compares reference ARB content vs. target ARB content and returns:
+      - Missing/extra keys
+      - Empty translations
+      - Identical translations
+      - Parameter / text issues
+    Both dicts are expected to hold content entries only, i.e. to have had
+    @-prefixed metadata split out via split_arb.
+    """
+    ref_keys = set(reference_data)
+    tgt_keys = set(target_data)
+
+    missing_keys = sorted(ref_keys - tgt_keys)
+    extra_keys = sorted(tgt_keys - ref_keys)
+
+    empty_translations: list[str] = []
+    identical_translations: list[str] = []
+
+    # Issues are accumulated struct-of-arrays style: six parallel lists
+    # instead of a list of small dicts. The columnar layout is cheaper to
+    # serialize and feeds straight into a dataframe for rendering.
+    issue_keys: list[str] = []
+    issue_refs: list[str] = []
+    issue_tgts: list[str] = []
+    issue_missing: list[list[str]] = []
+    issue_extra: list[list[str]] = []
+    issue_text: list[list[str]] = []
+
+    lang_code = detect_language_code(target_file_name) or "unknown"
+    # Pick the language-specific checker once instead of re-testing
+    # lang_code on every key.
+    checker = _check_ja if lang_code == "ja" else _check_default
+
+    # Compare only keys that exist in both
+    for key in sorted(ref_keys & tgt_keys):
+        ref_val = reference_data[key]
+        tgt_val = target_data[key]
+
+        # Check empty
+        if not isinstance(ref_val, str) or not isinstance(tgt_val, str):
+            continue
+
+        # Strip only for the empty/identical decisions; the originals keep
+        # the leading/trailing whitespace that check_text_issues looks for.
+        ref_stripped = ref_val.strip()
+        tgt_stripped = tgt_val.strip()
+
+        # Empty and identical translations need no further analysis:
+        # identical strings trivially agree on params and formatting.
+        if not tgt_stripped:
+            empty_translations.append(key)
+            continue
+        elif ref_stripped == tgt_stripped:
+            identical_translations.append(key)
+            continue
+
+        # Check parameters. Most entries have no placeholders at all, so a
+        # cheap substring test guards the regex scans.
+        if "{" in ref_val or "{" in tgt_val:
+            ref_params = extract_params(ref_val)
+            tgt_params = extract_params(tgt_val)
+            missing_params = sorted(ref_params - tgt_params)
+            extra_params = sorted(tgt_params - ref_params)
+        else:
+            missing_params = []
+            extra_params = []
+
+        # Check text/format issues
+        text_issues = checker(ref_val, tgt_val)
+
+        if missing_params or extra_params or text_issues:
+            issue_keys.append(key)
+            issue_refs.append(ref_val)
+            issue_tgts.append(tgt_val)
+            issue_missing.append(missing_params)
+            issue_extra.append(extra_params)
+            issue_text.append(text_issues)
+
+    return {
+        "langCode": lang_code,
+        "missingKeys": missing_keys,
+        "extraKeys": extra_keys,
+        "emptyTranslations": empty_translations,
+        "identicalTranslations": identical_translations,
+        "parameterIssues": {
+            "keys": issue_keys,
+            "refs": issue_refs,
+            "tgts": issue_tgts,
+            "missing": issue_missing,
+            "extra": issue_extra,
+            "text": issue_text,
+        },
+    }